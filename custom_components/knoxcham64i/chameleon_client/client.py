@@ -3,6 +3,8 @@
 import asyncio
 import logging
 import re
+import time
+from collections import deque
 from typing import Dict, List, Optional
 
 from .commands import ChameleonCommands
@@ -12,6 +14,10 @@ from .models import ZoneState
 
 _LOGGER = logging.getLogger(__name__)
 
+# VTB reply fields, e.g. "V:32  M:1 ..."; volume may carry a sign ("V:+4")
+_VTB_VOLUME_RE = re.compile(r'V:([+-]?\d+)')
+_VTB_MUTE_RE = re.compile(r'M:(\d+)')
+
 
 class ChameleonClient:
     """Async client for Knox Chameleon64i video routing switcher."""
@@ -22,6 +28,7 @@ class ChameleonClient:
         port: int = 8899,
         timeout: float = 3.0,  # Optimized for balance between reliability and speed
         max_retries: int = 3,
+        max_concurrent_refreshes: int = 1,
     ) -> None:
         """Initialize client.
 
@@ -30,6 +37,8 @@ class ChameleonClient:
             port: TCP port (default 8899)
             timeout: Socket timeout in seconds (default 3.0 - balanced for HF2211A)
             max_retries: Maximum retry attempts
+            max_concurrent_refreshes: get_all_zones_state() calls allowed to
+                run at once; extra callers wait for a free slot
         """
         self.host = host
         self.port = port
@@ -41,6 +50,19 @@ class ChameleonClient:
         )
         self._commands = ChameleonCommands()
 
+        # Refresh admission control. Overlapping refresh cycles would share
+        # the single LOW queue and eat into each other's time budget.
+        self._refresh_cv = asyncio.Condition()
+        self._active_refreshes = 0
+        self._max_refreshes = max(1, max_concurrent_refreshes)
+
+        # Recent per-zone VTB query latencies (seconds), newest last
+        self._vtb_latency: deque = deque(maxlen=256)
+
+        # Result of the most recent get_all_zones_state() and when it finished
+        self._last_states: Dict[int, ZoneState] = {}
+        self._last_states_ts: Optional[float] = None
+
     @property
     def is_connected(self) -> bool:
         """Check if client is connected."""
@@ -378,7 +400,7 @@ class ChameleonClient:
         data = result["data"]
 
         # Parse VTB data: "V:XX  M:X  L:X  BL:XX BR:XX B: X T: X"
-        mute_match = re.search(r'M:(\d+)', data)
+        mute_match = _VTB_MUTE_RE.search(data)
         if mute_match:
             mute_val = int(mute_match.group(1))
             is_muted = mute_val == 1
@@ -429,7 +451,7 @@ class ChameleonClient:
 
             # Volume - handle format like "V:+4" or "V:-5" or "V:32"
             # Note: Knox may return negative values for some configurations
-            volume_match = re.search(r'V:([+-]?\d+)', vtb_data)
+            volume_match = _VTB_VOLUME_RE.search(vtb_data)
             if volume_match:
                 volume = int(volume_match.group(1))
                 _LOGGER.debug("Found volume: %d", volume)
@@ -442,7 +464,7 @@ class ChameleonClient:
                 _LOGGER.debug("Zone %d has no volume in VTB response", zone)
 
             # Mute
-            mute_match = re.search(r'M:(\d+)', vtb_data)
+            mute_match = _VTB_MUTE_RE.search(vtb_data)
             if mute_match:
                 mute_val = int(mute_match.group(1))
                 state.is_muted = (mute_val == 1)
@@ -470,12 +492,54 @@ class ChameleonClient:
         _LOGGER.debug("Zone %d state: %s", zone, state)
         return state
 
+    def vtb_latency_p95(self) -> Optional[float]:
+        """95th percentile of recent per-zone VTB query latency.
+
+        Returns:
+            Latency in seconds, or None before any refresh has run
+        """
+        if not self._vtb_latency:
+            return None
+        samples = sorted(self._vtb_latency)
+        return samples[min(len(samples) - 1, int(len(samples) * 0.95))]
+
+    def get_cached_states(
+        self, zones: List[int], max_age: float = 30.0
+    ) -> Dict[int, ZoneState]:
+        """Get zone states from the last get_all_zones_state() without I/O.
+
+        Args:
+            zones: Zone numbers wanted
+            max_age: Ignore the cache if older than this many seconds
+
+        Returns:
+            Dict of the requested zones that are cached (empty if stale)
+        """
+        if self._last_states_ts is None or time.monotonic() - self._last_states_ts > max_age:
+            return {}
+        return {z: self._last_states[z] for z in zones if z in self._last_states}
+
+    async def set_max_concurrent_refreshes(self, limit: int) -> None:
+        """Change how many get_all_zones_state() calls may run at once.
+
+        Args:
+            limit: New limit (at least 1); waiting callers are re-checked
+        """
+        if limit < 1:
+            raise ValueError(f"Refresh limit must be at least 1, got {limit}")
+        async with self._refresh_cv:
+            self._max_refreshes = limit
+            self._refresh_cv.notify_all()
+
     async def get_all_zones_state(
         self, zones: List[int], max_refresh_seconds: float = 90.0,
         previous_states: Optional[Dict[int, ZoneState]] = None,
     ) -> Dict[int, ZoneState]:
         """Get state for multiple zones efficiently.
 
+        Waits for a refresh slot first (see max_concurrent_refreshes); the
+        time budget starts once the slot is acquired.
+
         Args:
             zones: List of zone numbers to query
             max_refresh_seconds: Maximum total time for the refresh cycle.
@@ -493,8 +557,40 @@ class ChameleonClient:
         3. Fetch VTB data SEQUENTIALLY with a total time budget
         This reduces from 2N commands to 1 + N commands.
         """
-        import time as _time
-        refresh_start = _time.monotonic()
+        async with self._refresh_cv:
+            await self._refresh_cv.wait_for(
+                lambda: self._active_refreshes < self._max_refreshes
+            )
+            self._active_refreshes += 1
+        try:
+            states = await self._get_all_zones_state(
+                zones, max_refresh_seconds, previous_states
+            )
+            self._last_states = states
+            self._last_states_ts = time.monotonic()
+            return states
+        finally:
+            # Free the slot before awaiting the lock so a cancellation here
+            # can't leak it, and notify from a shielded task so it can't
+            # lose the wake-up either
+            self._active_refreshes -= 1
+            await asyncio.shield(self._wake_refresh_waiters())
+
+    async def _wake_refresh_waiters(self) -> None:
+        """Wake every waiting refresh; wait_for() rechecks the slot count.
+
+        notify(1) could be lost if the woken waiter is cancelled before it
+        re-takes the lock, stranding the others behind a free slot.
+        """
+        async with self._refresh_cv:
+            self._refresh_cv.notify_all()
+
+    async def _get_all_zones_state(
+        self, zones: List[int], max_refresh_seconds: float,
+        previous_states: Optional[Dict[int, ZoneState]],
+    ) -> Dict[int, ZoneState]:
+        """Run one refresh cycle (see get_all_zones_state)."""
+        refresh_start = time.monotonic()
         states = {}
         prev = previous_states or {}
 
@@ -503,8 +599,11 @@ class ChameleonClient:
         crosspoint_map = {}  # zone_id -> input_id
         max_zone = max(zones) if zones else 36
 
-        # Determine which crosspoint ranges to query
-        cp_ranges = [(1, min(36, max_zone))]  # Always query 1-36 (or less)
+        # Determine which crosspoint ranges to query; one dump per block,
+        # and a block with none of the requested zones is skipped entirely
+        cp_ranges = []
+        if not zones or min(zones) <= 36:
+            cp_ranges.append((1, min(36, max_zone)))  # 1-36 (or less)
         if max_zone > 36:
             cp_ranges.append((37, min(64, max_zone)))
 
@@ -553,7 +652,7 @@ class ChameleonClient:
 
         for zone in vtb_query_order:
             # Check time budget before each query
-            elapsed = _time.monotonic() - refresh_start
+            elapsed = time.monotonic() - refresh_start
             if elapsed > max_refresh_seconds:
                 vtb_skipped = len(zones) - len(vtb_map)
                 _LOGGER.warning(
@@ -563,6 +662,7 @@ class ChameleonClient:
                 )
                 break
 
+            query_start = time.monotonic()
             try:
                 vtb_command = self._commands.get_vtb(zone)
                 vtb_response = await self._send_command(vtb_command)
@@ -576,8 +676,9 @@ class ChameleonClient:
             except Exception as err:
                 _LOGGER.debug("Failed to get VTB for zone %d: %s", zone, err)
                 vtb_map[zone] = None
+            self._vtb_latency.append(time.monotonic() - query_start)
 
-        elapsed = _time.monotonic() - refresh_start
+        elapsed = time.monotonic() - refresh_start
         _LOGGER.debug(
             "VTB queries: %d success, %d failed, %d skipped in %.1fs",
             vtb_success, len(vtb_map) - vtb_success, vtb_skipped, elapsed
@@ -599,7 +700,7 @@ class ChameleonClient:
 
             if vtb_data:
                 # Parse volume
-                volume_match = re.search(r'V:([+-]?\d+)', vtb_data)
+                volume_match = _VTB_VOLUME_RE.search(vtb_data)
                 if volume_match:
                     volume = int(volume_match.group(1))
                     if 0 <= volume <= 63:
@@ -622,7 +723,7 @@ class ChameleonClient:
                         state.volume = min(zone, 40)
 
                 # Parse mute
-                mute_match = re.search(r'M:(\d+)', vtb_data)
+                mute_match = _VTB_MUTE_RE.search(vtb_data)
                 if mute_match:
                     state.is_muted = (int(mute_match.group(1)) == 1)
                 else:
@@ -20,6 +20,17 @@ from .scheduler import CommandScheduler, Priority
 _LOGGER = logging.getLogger(__name__)
 
 
+# Retry backoff: base * 2**attempt capped at _RETRY_BACKOFF_CAP. No jitter -
+# all I/O runs on the one scheduler worker, so there are no concurrent
+# retries to spread out, and every extra second blocks HIGH user commands
+_RETRY_BACKOFF_CAP = 2.0
+
+
+def _retry_delay(base: float, attempt: int) -> float:
+    """Seconds to wait before retry number attempt + 1."""
+    return min(_RETRY_BACKOFF_CAP, base * 2 ** attempt)
+
+
 class ChameleonConnectionBlocking:
     """Blocking socket connection with priority command scheduling.
 
@@ -28,6 +39,10 @@ class ChameleonConnectionBlocking:
         - Refresh queries get LOW priority
         - Worker always processes HIGH before LOW
         - Maximum wait for user command: ~1-2 seconds (one device I/O)
+
+    Commands are never pipelined: Knox replies carry no transaction ID to
+    match them back to requests, and the HF2211A needs a fresh connection
+    per command, so one command is on the wire at a time.
     """
 
     def __init__(
@@ -124,6 +139,8 @@ class ChameleonConnectionBlocking:
 
                 _LOGGER.debug("cmd id=%d connecting to %s:%d", trace_id, self.host, self.port)
                 sock.connect((self.host, self.port))
+                # Commands are a few bytes - send them without Nagle delay
+                sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
 
                 # HF2211A sends initialization bytes - wait and flush
                 time.sleep(0.2)
@@ -212,9 +229,8 @@ class ChameleonConnectionBlocking:
                     trace_id, attempt + 1, self.max_retries, io_ms
                 )
                 if attempt < retries - 1:
-                    # Progressive backoff: 1s, 2s to let device recover
-                    backoff = (attempt + 1) * 1.0
-                    time.sleep(backoff)
+                    # Exponential backoff from 1s to let device recover
+                    time.sleep(_retry_delay(1.0, attempt))
                     continue
                 raise ChameleonTimeoutError(f"Command timed out: {command}")
 
@@ -225,7 +241,7 @@ class ChameleonConnectionBlocking:
                     trace_id, attempt + 1, self.max_retries, io_ms, err
                 )
                 if attempt < retries - 1:
-                    time.sleep(0.5)
+                    time.sleep(_retry_delay(0.5, attempt))
                     continue
                 raise ChameleonConnectionError(f"Command failed: {err}") from err
 
@@ -4,9 +4,12 @@ from dataclasses import dataclass
 from typing import Optional
 
 
-@dataclass
+@dataclass(slots=True)
 class ZoneState:
-    """Represents the current state of a zone."""
+    """Represents the current state of a zone.
+
+    Slotted: one instance per zone is built on every refresh.
+    """
 
     zone_id: int
     input_id: Optional[int] = None
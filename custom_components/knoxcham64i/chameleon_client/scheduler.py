@@ -246,6 +246,15 @@ class CommandScheduler:
                 if request is None:
                     continue
 
+                # Caller gave up while queued (e.g. its task was cancelled) -
+                # don't spend device time on a result nobody will read
+                if request.future.cancelled():
+                    _LOGGER.debug(
+                        "cmd id=%d cmd=%s skipped, cancelled while queued",
+                        request.trace_id, request.command
+                    )
+                    continue
+
                 # Execute the command
                 self._current_request = request
                 queue_wait_ms = int((time.monotonic() - request.queued_at) * 1000)
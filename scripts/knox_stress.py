@@ -7,9 +7,10 @@ Run this while monitoring HA logs to identify any remaining stalls.
 
 Usage:
     python3 knox_stress.py --host 192.168.0.69 --zone 29 --iterations 100
+    python3 knox_stress.py --host 192.168.0.69 --iterations 100000 --log results.csv
 
 Requirements:
-    - Python 3.9+
+    - Python 3.10+
     - No external dependencies (uses stdlib only)
 
 What it tests:
@@ -21,21 +22,37 @@ What it tests:
 
 import argparse
 import asyncio
+import csv
+import logging
+import logging.handlers
+import queue
 import random
 import socket
+import sys
 import time
 from dataclasses import dataclass
 from typing import Optional
 
+try:
+    import uvloop
+except ImportError:  # Optional faster event loop - asyncio's default loop is used without it
+    uvloop = None
 
-@dataclass
+# Progress output goes through a QueueHandler so the event loop never blocks
+# on stdout; main() attaches the listener that does the actual writing.
+_LOGGER = logging.getLogger("knox_stress")
+
+_NS_PER_MS = 1_000_000
+
+
+@dataclass(slots=True)
 class CommandResult:
     """Result of a single command execution."""
     command: str
     trace_id: int
-    lock_wait_ms: int
-    io_ms: int
-    total_ms: int
+    lock_wait_ns: int
+    io_ns: int
+    total_ns: int
     success: bool
     error: Optional[str] = None
 
@@ -43,127 +60,228 @@ class CommandResult:
 class KnoxStressTest:
     """Stress test for Knox Chameleon64i."""
 
-    def __init__(self, host: str, port: int = 8899, timeout: float = 3.0):
+    def __init__(
+        self,
+        host: str,
+        port: int = 8899,
+        timeout: float = 3.0,
+        quiet: bool = False,
+        log_path: Optional[str] = None,
+        keep_in_memory: bool = False,
+    ):
         self.host = host
         self.port = port
         self.timeout = timeout
+        self.timeout_ns = int(timeout * 1_000_000_000)
+        self.quiet = quiet  # Buffer per-iteration lines and write them once per test
+        self.keep_in_memory = keep_in_memory
         self._lock = asyncio.Lock()
         self._trace_counter = 0
         self._results: list[CommandResult] = []
+        # Repeated commands (e.g. "$M291") share one string object across results
+        self._cmd_intern: dict[str, str] = {}
+
+        # Running statistics so long runs don't need every result in RAM
+        self._stats = {
+            "total": 0,
+            "success": 0,
+            "lock_min": None,
+            "lock_max": 0,
+            "lock_sum": 0,
+            "io_count": 0,
+            "io_min": None,
+            "io_max": 0,
+            "io_sum": 0,
+            "slow_lock_count": 0,
+            "slow_lock": [],  # First 5 commands with lock wait > 2s
+            "failures": [],
+        }
+
+        # Optional append-only CSV log of every result
+        self._log_file = None
+        self._writer = None
+        if log_path:
+            self._log_file = open(log_path, "w", newline="")
+            self._writer = csv.writer(self._log_file)
+            self._writer.writerow(
+                ("trace_id", "command", "lock_wait_ns", "io_ns", "total_ns", "success", "error")
+            )
+
+    def close(self) -> None:
+        """Close the CSV results log, if any."""
+        if self._log_file is not None:
+            self._log_file.close()
+            self._log_file = None
+            self._writer = None
+
+    def _record(self, result: CommandResult) -> None:
+        """Fold a result into the running stats and stream it to the CSV log."""
+        stats = self._stats
+        stats["total"] += 1
+
+        lock_ns = result.lock_wait_ns
+        stats["lock_sum"] += lock_ns
+        stats["lock_max"] = max(stats["lock_max"], lock_ns)
+        if stats["lock_min"] is None or lock_ns < stats["lock_min"]:
+            stats["lock_min"] = lock_ns
+
+        if result.success:
+            stats["success"] += 1
+            stats["io_count"] += 1
+            stats["io_sum"] += result.io_ns
+            stats["io_max"] = max(stats["io_max"], result.io_ns)
+            if stats["io_min"] is None or result.io_ns < stats["io_min"]:
+                stats["io_min"] = result.io_ns
+        else:
+            stats["failures"].append(result)
+
+        if lock_ns > 2000 * _NS_PER_MS:
+            stats["slow_lock_count"] += 1
+            if len(stats["slow_lock"]) < 5:
+                stats["slow_lock"].append(result)
+
+        if self._writer is not None:
+            self._writer.writerow((
+                result.trace_id, result.command, result.lock_wait_ns, result.io_ns,
+                result.total_ns, result.success, result.error or "",
+            ))
+
+        if self.keep_in_memory:
+            self._results.append(result)
 
     def _next_trace_id(self) -> int:
         self._trace_counter += 1
         return self._trace_counter
 
-    def _send_command_sync(self, command: str) -> tuple[str, float]:
-        """Send command synchronously (blocking)."""
-        io_start = time.monotonic()
-        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-        sock.settimeout(self.timeout)
+    async def _send_command_async(self, payload: bytes) -> tuple[str, int]:
+        """Send a pre-encoded, \\r-terminated command on a fresh asyncio stream."""
+        io_start_ns = time.monotonic_ns()
+        reader, writer = await asyncio.wait_for(
+            asyncio.open_connection(self.host, self.port), timeout=self.timeout
+        )
 
         try:
-            sock.connect((self.host, self.port))
-            time.sleep(0.2)  # HF2211A init delay
-
-            # Flush init bytes
-            sock.setblocking(False)
+            # Commands are a few bytes - don't let Nagle hold them back, and size
+            # the receive buffer so a full crosspoint dump (D0164) fits in one recv
+            sock = writer.get_extra_info("socket")
+            if sock is not None:
+                sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+                sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 256 * 1024)
+                sock.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, 64 * 1024)
+                sock.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+
+            await asyncio.sleep(0.2)  # HF2211A init delay
+
+            # Flush init bytes - the transport has already buffered them
             try:
-                while True:
-                    sock.recv(4096)
-            except BlockingIOError:
+                await asyncio.wait_for(reader.read(65536), timeout=0.01)
+            except asyncio.TimeoutError:
                 pass
-            finally:
-                sock.setblocking(True)
-                sock.settimeout(self.timeout)
 
             # Send command
-            sock.sendall(f"{command}\r".encode())
+            writer.write(payload)
+            await writer.drain()
 
-            # Read response
+            # Read response. Not every reply ends in DONE (ERROR, bare VTB
+            # dumps), so 200ms of silence after data also ends the read.
             response_data = bytearray()
-            sock.settimeout(0.2)
-            start = time.time()
+            deadline_ns = time.monotonic_ns() + self.timeout_ns
+
+            while True:
+                remaining_ns = deadline_ns - time.monotonic_ns()
+                if remaining_ns <= 0:
+                    break
 
-            while time.time() - start < self.timeout:
                 try:
-                    chunk = sock.recv(4096)
-                    if chunk:
-                        response_data.extend(chunk)
-                        resp_str = response_data.decode("utf-8", errors="ignore")
-                        if "DONE" in resp_str or "ERROR" in resp_str:
-                            break
-                    else:
-                        break
-                except socket.timeout:
+                    chunk = await asyncio.wait_for(
+                        reader.read(4096), timeout=min(remaining_ns / 1e9, 0.2)
+                    )
+                except asyncio.TimeoutError:
                     if response_data:
                         break
+                    continue
+
+                if not chunk:
+                    break
+                response_data.extend(chunk)
+                if b"DONE" in response_data or b"ERROR" in response_data:
+                    break
 
-            io_ms = (time.monotonic() - io_start) * 1000
-            return response_data.decode("utf-8", errors="ignore"), io_ms
+            io_ns = time.monotonic_ns() - io_start_ns
+            return response_data.decode("utf-8", errors="ignore"), io_ns
 
         finally:
-            sock.close()
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except OSError:
+                pass
 
-    async def send_command(self, command: str, priority: bool = False) -> CommandResult:
-        """Send command with lock management."""
+    async def send_command(
+        self, command: str, priority: bool = False, payload: Optional[bytes] = None
+    ) -> CommandResult:
+        """Send command with lock management.
+
+        If payload is given it must be the pre-encoded command including the
+        trailing \\r; it is sent as-is and command is only used for reporting.
+        """
         trace_id = self._next_trace_id()
-        total_start = time.monotonic()
-        lock_start = time.monotonic()
+        command = self._cmd_intern.setdefault(command, command)
+        total_start_ns = lock_start_ns = time.monotonic_ns()
 
         # Acquire lock (with timeout for priority commands)
         if priority:
             try:
                 await asyncio.wait_for(self._lock.acquire(), timeout=5.0)
             except asyncio.TimeoutError:
-                lock_wait_ms = int((time.monotonic() - lock_start) * 1000)
+                lock_wait_ns = time.monotonic_ns() - lock_start_ns
                 result = CommandResult(
                     command=command,
                     trace_id=trace_id,
-                    lock_wait_ms=lock_wait_ms,
-                    io_ms=0,
-                    total_ms=lock_wait_ms,
+                    lock_wait_ns=lock_wait_ns,
+                    io_ns=0,
+                    total_ns=lock_wait_ns,
                     success=False,
                     error="LockTimeout"
                 )
-                self._results.append(result)
+                self._record(result)
                 return result
         else:
             await self._lock.acquire()
 
-        lock_wait_ms = int((time.monotonic() - lock_start) * 1000)
+        lock_wait_ns = time.monotonic_ns() - lock_start_ns
 
         try:
-            loop = asyncio.get_event_loop()
-            response, io_ms = await loop.run_in_executor(
-                None, self._send_command_sync, command
-            )
-            total_ms = int((time.monotonic() - total_start) * 1000)
+            if payload is None:
+                payload = f"{command}\r".encode()
+            response, io_ns = await self._send_command_async(payload)
+            total_ns = time.monotonic_ns() - total_start_ns
 
-            success = "DONE" in response or response.strip()
+            success = bool("DONE" in response or response.strip())
             result = CommandResult(
                 command=command,
                 trace_id=trace_id,
-                lock_wait_ms=lock_wait_ms,
-                io_ms=int(io_ms),
-                total_ms=total_ms,
+                lock_wait_ns=lock_wait_ns,
+                io_ns=io_ns,
+                total_ns=total_ns,
                 success=success,
                 error=None if success else "NoResponse"
             )
-            self._results.append(result)
+            self._record(result)
             return result
 
         except Exception as e:
-            total_ms = int((time.monotonic() - total_start) * 1000)
+            total_ns = time.monotonic_ns() - total_start_ns
             result = CommandResult(
                 command=command,
                 trace_id=trace_id,
-                lock_wait_ms=lock_wait_ms,
-                io_ms=0,
-                total_ms=total_ms,
+                lock_wait_ns=lock_wait_ns,
+                io_ns=0,
+                total_ns=total_ns,
                 success=False,
                 error=str(e)
             )
-            self._results.append(result)
+            self._record(result)
             return result
 
         finally:
@@ -171,47 +289,83 @@ class KnoxStressTest:
 
     async def test_mute_toggle(self, zone: int, iterations: int = 200) -> None:
         """Test rapid mute toggles."""
-        print(f"\n=== Testing {iterations} mute toggles on zone {zone} ===")
+        _LOGGER.info("\n=== Testing %d mute toggles on zone %d ===", iterations, zone)
+
+        # Pre-generate random delays so the loop body stays cheap and predictable
+        delays = [random.uniform(0.1, 0.5) for _ in range(iterations)]
+        lines: list[str] = []
+
+        # Only two distinct commands - build (str, wire bytes) for each once
+        mute_cmds = []
+        for digit in (1, 0):  # Index 0 mutes, index 1 unmutes
+            cmd = f"$M{zone:02d}{digit}"
+            mute_cmds.append((cmd, f"{cmd}\r".encode()))
 
         for i in range(iterations):
-            mute = i % 2 == 0
-            cmd = f"$M{zone:02d}{1 if mute else 0}"
-            result = await self.send_command(cmd, priority=True)
+            cmd, cmd_bytes = mute_cmds[i % 2]
+            result = await self.send_command(cmd, priority=True, payload=cmd_bytes)
 
             status = "OK" if result.success else f"FAIL ({result.error})"
-            print(f"  [{i+1:3d}/{iterations}] {cmd} - lock={result.lock_wait_ms}ms io={result.io_ms}ms total={result.total_ms}ms [{status}]")
+            line = f"  [{i+1:3d}/{iterations}] {cmd} - lock={result.lock_wait_ns // _NS_PER_MS}ms io={result.io_ns // _NS_PER_MS}ms total={result.total_ns // _NS_PER_MS}ms [{status}]"
+            if not result.success:
+                _LOGGER.warning(line)
+            elif self.quiet:
+                lines.append(line)
+            else:
+                _LOGGER.info(line)
 
             # Random delay between commands
-            await asyncio.sleep(random.uniform(0.1, 0.5))
+            await asyncio.sleep(delays[i])
+
+        if lines:
+            _LOGGER.info("\n".join(lines))
 
     async def test_volume_changes(self, zone: int, iterations: int = 50) -> None:
         """Test volume changes."""
-        print(f"\n=== Testing {iterations} volume changes on zone {zone} ===")
+        _LOGGER.info("\n=== Testing %d volume changes on zone %d ===", iterations, zone)
 
-        for i in range(iterations):
-            volume = random.randint(0, 63)
+        delays = [random.uniform(0.1, 0.3) for _ in range(iterations)]
+        vols = [random.randint(0, 63) for _ in range(iterations)]
+        lines: list[str] = []
+
+        # (str, wire bytes) for every volume, built once rather than per iteration
+        vol_cmds = []
+        for volume in range(64):
             cmd = f"$V{zone:02d}{volume:02d}"
-            result = await self.send_command(cmd, priority=True)
+            vol_cmds.append((cmd, f"{cmd}\r".encode()))
+
+        for i in range(iterations):
+            cmd, cmd_bytes = vol_cmds[vols[i]]
+            result = await self.send_command(cmd, priority=True, payload=cmd_bytes)
 
             status = "OK" if result.success else f"FAIL ({result.error})"
-            print(f"  [{i+1:3d}/{iterations}] {cmd} - lock={result.lock_wait_ms}ms io={result.io_ms}ms total={result.total_ms}ms [{status}]")
+            line = f"  [{i+1:3d}/{iterations}] {cmd} - lock={result.lock_wait_ns // _NS_PER_MS}ms io={result.io_ns // _NS_PER_MS}ms total={result.total_ns // _NS_PER_MS}ms [{status}]"
+            if not result.success:
+                _LOGGER.warning(line)
+            elif self.quiet:
+                lines.append(line)
+            else:
+                _LOGGER.info(line)
 
-            await asyncio.sleep(random.uniform(0.1, 0.3))
+            await asyncio.sleep(delays[i])
+
+        if lines:
+            _LOGGER.info("\n".join(lines))
 
     async def test_concurrent_load(self, zone: int, num_zones: int = 35) -> None:
         """Test coordinator-style polling concurrent with user commands."""
-        print(f"\n=== Testing concurrent load (simulating coordinator + user commands) ===")
+        _LOGGER.info("\n=== Testing concurrent load (simulating coordinator + user commands) ===")
 
         async def coordinator_poll():
             """Simulate coordinator polling all zones."""
-            print("  [COORD] Starting simulated coordinator poll...")
+            _LOGGER.info("  [COORD] Starting simulated coordinator poll...")
             for z in range(1, min(num_zones + 1, 37)):
                 cmd = f"$D{z:02d}"
                 result = await self.send_command(cmd, priority=False)
                 if z % 10 == 0:
-                    print(f"  [COORD] Polled zone {z}/{num_zones}")
+                    _LOGGER.info("  [COORD] Polled zone %d/%d", z, num_zones)
 
-            print("  [COORD] Poll complete")
+            _LOGGER.info("  [COORD] Poll complete")
 
         async def user_commands():
             """Simulate user commands during coordinator poll."""
@@ -219,15 +373,20 @@ class KnoxStressTest:
 
             for i in range(10):
                 cmd = f"$M{zone:02d}{i % 2}"
-                print(f"  [USER] Sending priority command: {cmd}")
-                start = time.monotonic()
+                _LOGGER.info("  [USER] Sending priority command: %s", cmd)
+                start_ns = time.monotonic_ns()
                 result = await self.send_command(cmd, priority=True)
-                elapsed = int((time.monotonic() - start) * 1000)
+                elapsed = (time.monotonic_ns() - start_ns) // _NS_PER_MS
 
                 if result.success:
-                    print(f"  [USER] Command {i+1} completed in {elapsed}ms (lock_wait={result.lock_wait_ms}ms)")
+                    _LOGGER.info(
+                        "  [USER] Command %d completed in %dms (lock_wait=%dms)",
+                        i + 1, elapsed, result.lock_wait_ns // _NS_PER_MS,
+                    )
                 else:
-                    print(f"  [USER] Command {i+1} FAILED: {result.error} (waited {elapsed}ms)")
+                    _LOGGER.warning(
+                        "  [USER] Command %d FAILED: %s (waited %dms)", i + 1, result.error, elapsed
+                    )
 
                 await asyncio.sleep(0.5)
 
@@ -240,48 +399,61 @@ class KnoxStressTest:
         print("STRESS TEST SUMMARY")
         print("=" * 60)
 
-        if not self._results:
+        stats = self._stats
+        total = stats["total"]
+        if not total:
             print("No results collected.")
             return
 
-        total = len(self._results)
-        success = sum(1 for r in self._results if r.success)
+        success = stats["success"]
         failed = total - success
 
-        lock_waits = [r.lock_wait_ms for r in self._results]
-        io_times = [r.io_ms for r in self._results if r.success]
-        total_times = [r.total_ms for r in self._results]
-
         print(f"Total commands: {total}")
         print(f"Successful: {success} ({100*success/total:.1f}%)")
         print(f"Failed: {failed} ({100*failed/total:.1f}%)")
 
-        if lock_waits:
-            print(f"\nLock wait times:")
-            print(f"  Min: {min(lock_waits)}ms")
-            print(f"  Max: {max(lock_waits)}ms")
-            print(f"  Avg: {sum(lock_waits)/len(lock_waits):.1f}ms")
+        print(f"\nLock wait times:")
+        print(f"  Min: {stats['lock_min'] // _NS_PER_MS}ms")
+        print(f"  Max: {stats['lock_max'] // _NS_PER_MS}ms")
+        print(f"  Avg: {stats['lock_sum'] / total / _NS_PER_MS:.1f}ms")
 
-        if io_times:
+        if stats["io_count"]:
             print(f"\nI/O times (successful commands):")
-            print(f"  Min: {min(io_times)}ms")
-            print(f"  Max: {max(io_times)}ms")
-            print(f"  Avg: {sum(io_times)/len(io_times):.1f}ms")
-
-        # Find commands with lock wait > 2s
-        slow_lock = [r for r in self._results if r.lock_wait_ms > 2000]
-        if slow_lock:
-            print(f"\nCommands with lock wait > 2s: {len(slow_lock)}")
-            for r in slow_lock[:5]:
-                print(f"  - {r.command}: lock_wait={r.lock_wait_ms}ms")
-
-        # Find failed commands
+            print(f"  Min: {stats['io_min'] // _NS_PER_MS}ms")
+            print(f"  Max: {stats['io_max'] // _NS_PER_MS}ms")
+            print(f"  Avg: {stats['io_sum'] / stats['io_count'] / _NS_PER_MS:.1f}ms")
+
+        # Commands with lock wait > 2s
+        if stats["slow_lock_count"]:
+            print(f"\nCommands with lock wait > 2s: {stats['slow_lock_count']}")
+            for r in stats["slow_lock"]:
+                print(f"  - {r.command}: lock_wait={r.lock_wait_ns // _NS_PER_MS}ms")
+
+        # Failed commands
         if failed > 0:
             print(f"\nFailed commands:")
-            for r in self._results:
-                if not r.success:
-                    print(f"  - {r.command}: {r.error} (lock_wait={r.lock_wait_ms}ms)")
-
+            for r in stats["failures"]:
+                print(f"  - {r.command}: {r.error} (lock_wait={r.lock_wait_ns // _NS_PER_MS}ms)")
+
+        # Exact percentiles need every sample, so only with --keep-in-memory
+        if self._results:
+            self._print_percentiles()
+
+    def _print_percentiles(self) -> None:
+        """Print p50/p95/p99 lock wait and I/O times from the retained results."""
+        samples = (
+            ("Lock wait", sorted(r.lock_wait_ns for r in self._results)),
+            ("I/O (successful commands)", sorted(r.io_ns for r in self._results if r.success)),
+        )
+        print(f"\nPercentiles ({len(self._results)} results kept in memory):")
+        for label, values in samples:
+            if not values:
+                continue
+            p50, p95, p99 = (values[min(len(values) - 1, len(values) * q // 100)] for q in (50, 95, 99))
+            print(
+                f"  {label}: p50={p50 // _NS_PER_MS}ms p95={p95 // _NS_PER_MS}ms "
+                f"p99={p99 // _NS_PER_MS}ms"
+            )
 
 async def main():
     parser = argparse.ArgumentParser(description="Knox Chameleon64i Stress Test")
@@ -291,6 +463,15 @@ async def main():
     parser.add_argument("--iterations", type=int, default=100, help="Number of mute toggles (default 100)")
     parser.add_argument("--test", choices=["mute", "volume", "concurrent", "all"], default="all",
                         help="Test type to run")
+    parser.add_argument("--quiet", action="store_true",
+                        help="Buffer per-iteration output and print it once per test")
+    parser.add_argument("--log", metavar="PATH",
+                        help="Stream every command result to this CSV file")
+    parser.add_argument("--keep-in-memory", action="store_true",
+                        help="Also keep every CommandResult in memory for percentile output")
+    parser.add_argument("--log-level", default="INFO",
+                        choices=["DEBUG", "INFO", "WARNING", "ERROR"],
+                        help="Progress output level; WARNING shows only failures (default INFO)")
 
     args = parser.parse_args()
 
@@ -299,7 +480,22 @@ async def main():
     print(f"Test zone: {args.zone}")
     print(f"Iterations: {args.iterations}")
 
-    tester = KnoxStressTest(args.host, args.port)
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    handler = logging.StreamHandler(sys.stdout)
+    handler.setFormatter(logging.Formatter("%(message)s"))
+    listener = logging.handlers.QueueListener(log_queue, handler)
+    _LOGGER.addHandler(logging.handlers.QueueHandler(log_queue))
+    _LOGGER.setLevel(args.log_level)
+    _LOGGER.propagate = False
+    listener.start()
+
+    tester = KnoxStressTest(
+        args.host,
+        args.port,
+        quiet=args.quiet,
+        log_path=args.log,
+        keep_in_memory=args.keep_in_memory,
+    )
 
     try:
         if args.test in ("mute", "all"):
@@ -311,12 +507,18 @@ async def main():
         if args.test in ("concurrent", "all"):
             await tester.test_concurrent_load(args.zone)
 
-        tester.print_summary()
-
     except KeyboardInterrupt:
-        print("\n\nTest interrupted by user.")
+        _LOGGER.warning("\n\nTest interrupted by user.")
+
+    finally:
+        # Drain queued progress output before the summary goes to stdout
+        listener.stop()
         tester.print_summary()
+        tester.close()
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    if uvloop is not None:
+        uvloop.run(main())
+    else:
+        asyncio.run(main())
@@ -2,11 +2,22 @@
 """Test different crosspoint query commands to find what works."""
 
 import asyncio
+import re
 import sys
 sys.path.insert(0, 'custom_components/knoxcham64i')
 
 from chameleon_client import ChameleonClient
 
+_OUTPUT_RE = re.compile(rb"OUTPUT\s+(\d+)\s+VIDEO\s+(\d+)\s+AUDIO\s+(\d+)")
+
+
+def parse_outputs(response: str) -> list[tuple[int, int, int]]:
+    """Extract (output, video, audio) tuples from a crosspoint response."""
+    return [
+        tuple(map(int, m.groups()))
+        for m in _OUTPUT_RE.finditer(response.encode())
+    ]
+
 
 async def test_commands():
     """Test various crosspoint commands."""
@@ -41,17 +52,8 @@ async def test_commands():
                 # Parse OUTPUT lines
                 if "OUTPUT" in response:
                     print("Found OUTPUT lines:")
-                    for line in response.split('\n'):
-                        if "OUTPUT" in line and "VIDEO" in line:
-                            parts = line.split()
-                            if len(parts) >= 6:
-                                try:
-                                    out_num = int(parts[1])
-                                    vid_input = int(parts[3])
-                                    aud_input = int(parts[5])
-                                    print(f"  OUTPUT {out_num}: Video={vid_input}, Audio={aud_input}")
-                                except:
-                                    pass
+                    for out_num, vid_input, aud_input in parse_outputs(response):
+                        print(f"  OUTPUT {out_num}: Video={vid_input}, Audio={aud_input}")
                     print()
             except Exception as e:
                 print(f"ERROR: {e}\n")
@@ -65,19 +67,10 @@ async def test_commands():
         response = await client._connection.send_command("D")
         zone_25_found = False
 
-        for line in response.split('\n'):
-            if "OUTPUT" in line and "VIDEO" in line:
-                parts = line.split()
-                if len(parts) >= 6:
-                    try:
-                        out_num = int(parts[1])
-                        if out_num == 25:
-                            vid_input = int(parts[3])
-                            aud_input = int(parts[5])
-                            print(f"✅ FOUND ZONE 25: Video={vid_input}, Audio={aud_input}")
-                            zone_25_found = True
-                    except:
-                        pass
+        for out_num, vid_input, aud_input in parse_outputs(response):
+            if out_num == 25:
+                print(f"✅ FOUND ZONE 25: Video={vid_input}, Audio={aud_input}")
+                zone_25_found = True
 
         if not zone_25_found:
             print("❌ Zone 25 not found in 'D' response")
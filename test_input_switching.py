@@ -7,15 +7,19 @@ sys.path.insert(0, 'custom_components/knoxcham64i')
 
 from chameleon_client import ChameleonClient
 
+_BANNER = "=" * 60
+
 
 async def test():
     client = ChameleonClient(host="192.168.0.69", port=8899)
 
     try:
-        print("\n" + "="*60)
-        print("ZONE 25 INPUT SWITCHING TEST")
-        print("="*60)
-        print("You should be in zone 25 (physically in that room) to hear changes.\n")
+        print(
+            f"\n{_BANNER}\n"
+            "ZONE 25 INPUT SWITCHING TEST\n"
+            f"{_BANNER}\n"
+            "You should be in zone 25 (physically in that room) to hear changes.\n"
+        )
 
         await client.connect()
 
@@ -67,10 +71,12 @@ async def test():
         state = await client.get_zone_state(25)
         print(f"   ✅ Restored to input {state.input_id}\n")
 
-        print("="*60)
-        print("TEST COMPLETE")
-        print("If you heard the audio source change, it's working!")
-        print("="*60)
+        print(
+            f"{_BANNER}\n"
+            "TEST COMPLETE\n"
+            "If you heard the audio source change, it's working!\n"
+            f"{_BANNER}"
+        )
 
     except Exception as e:
         print(f"\n❌ Error: {e}")
@@ -7,6 +7,8 @@ sys.path.insert(0, 'custom_components/knoxcham64i')
 
 from chameleon_client import ChameleonClient
 
+_BANNER = "=" * 60
+
 
 async def test_knox():
     """Run comprehensive tests on Knox device."""
@@ -14,11 +16,13 @@ async def test_knox():
     host = "192.168.0.69"
     port = 8899
 
-    print(f"\n{'='*60}")
-    print(f"Knox Chameleon64i Connection Test")
-    print(f"{'='*60}")
-    print(f"Host: {host}")
-    print(f"Port: {port}\n")
+    sys.stdout.write(
+        f"\n{_BANNER}\n"
+        "Knox Chameleon64i Connection Test\n"
+        f"{_BANNER}\n"
+        f"Host: {host}\n"
+        f"Port: {port}\n\n"
+    )
 
     client = ChameleonClient(host=host, port=port, timeout=5.0, max_retries=3)
 
@@ -41,12 +45,15 @@ async def test_knox():
 
         # Test 3: Zone 25 state
         print("Test 3: Getting zone 25 state...")
+        state = None
         try:
             state = await client.get_zone_state(25)
-            print(f"✅ Zone 25 State:")
-            print(f"   - Input ID: {state.input_id}")
-            print(f"   - Volume: {state.volume} (0-63, 0=loudest)")
-            print(f"   - Muted: {state.is_muted}\n")
+            sys.stdout.write(
+                "✅ Zone 25 State:\n"
+                f"   - Input ID: {state.input_id}\n"
+                f"   - Volume: {state.volume} (0-63, 0=loudest)\n"
+                f"   - Muted: {state.is_muted}\n\n"
+            )
         except Exception as e:
             print(f"❌ Zone 25 state failed: {e}\n")
 
@@ -61,69 +68,88 @@ async def test_knox():
         except Exception as e:
             print(f"❌ Set input failed: {e}\n")
 
-        # Test 5: Volume control test
-        print("Test 5: Testing volume control (zone 25)...")
-        try:
-            # Save current volume
-            current_state = await client.get_zone_state(25)
-            original_volume = current_state.volume if current_state.volume is not None else 30
-
-            # Test setting volume to 20 (mid-level)
-            result = await client.set_volume(25, 20)
-            if result:
-                print("✅ Set volume command accepted")
-
-                # Verify it changed
-                await asyncio.sleep(0.5)
-                new_state = await client.get_zone_state(25)
-                print(f"   - New volume: {new_state.volume}\n")
-
-                # Restore original volume
-                await client.set_volume(25, original_volume)
-                print(f"   - Restored to: {original_volume}\n")
-            else:
-                print("⚠️  Set volume command not confirmed\n")
-        except Exception as e:
-            print(f"❌ Volume test failed: {e}\n")
-
-        # Test 6: Mute control test
-        print("Test 6: Testing mute control (zone 25)...")
-        try:
-            # Get current mute state
-            current_state = await client.get_zone_state(25)
-            original_mute = current_state.is_muted
-
-            # Toggle mute
-            result = await client.set_mute(25, not original_mute)
-            if result:
-                print(f"✅ Set mute to {not original_mute}")
-
-                # Restore original
-                await asyncio.sleep(0.5)
-                await client.set_mute(25, original_mute)
-                print(f"   - Restored to: {original_mute}\n")
-            else:
-                print("⚠️  Set mute command not confirmed\n")
-        except Exception as e:
-            print(f"❌ Mute test failed: {e}\n")
+        # Tests 5-6 restore from the Test 3 state and share one verify read
+        # after both writes instead of a get_zone_state round trip per set.
+        # Without that state there is nothing safe to restore, so don't write.
+        if state is None:
+            print("Tests 5-6: Skipped (zone 25 state unknown, nothing to restore to)\n")
+        else:
+            original_volume = state.volume if state.volume is not None else 30
+            original_mute = state.is_muted
+            volume_set = mute_set = False
+
+            try:
+                # Test 5: Volume control test
+                print("Test 5: Testing volume control (zone 25)...")
+                try:
+                    # Test setting volume to 20 (mid-level)
+                    volume_set = await client.set_volume(25, 20)
+                    if volume_set:
+                        print("✅ Set volume command accepted\n")
+                    else:
+                        print("⚠️  Set volume command not confirmed\n")
+                except Exception as e:
+                    print(f"❌ Volume test failed: {e}\n")
+
+                # Test 6: Mute control test
+                print("Test 6: Testing mute control (zone 25)...")
+                try:
+                    # Toggle mute
+                    mute_set = await client.set_mute(25, not original_mute)
+                    if mute_set:
+                        print(f"✅ Set mute to {not original_mute}\n")
+                    else:
+                        print("⚠️  Set mute command not confirmed\n")
+                except Exception as e:
+                    print(f"❌ Mute test failed: {e}\n")
+
+                if volume_set or mute_set:
+                    try:
+                        # Verify both changes
+                        await asyncio.sleep(0.5)
+                        new_state = (await client.get_all_zones_state([25])).get(25)
+                        if new_state is not None:
+                            print(f"   - New volume: {new_state.volume}, muted: {new_state.is_muted}")
+                    except Exception as e:
+                        print(f"❌ Verify failed: {e}")
+            finally:
+                # Restore originals even if the verify read failed
+                if volume_set:
+                    try:
+                        await client.set_volume(25, original_volume)
+                        print(f"   - Volume restored to: {original_volume}")
+                    except Exception as e:
+                        print(f"❌ Volume restore failed: {e}")
+                if mute_set:
+                    try:
+                        await client.set_mute(25, original_mute)
+                        print(f"   - Mute restored to: {original_mute}")
+                    except Exception as e:
+                        print(f"❌ Mute restore failed: {e}")
+                if volume_set or mute_set:
+                    print()
 
         # Test 7: Multiple zones state (test coordinator behavior)
         print("Test 7: Testing multiple zones state fetch...")
         try:
             zones = [25, 1, 2]  # Test a few zones
             states = await client.get_all_zones_state(zones)
-            print(f"✅ Retrieved {len(states)} zone states:")
-            for zone_id, state in states.items():
-                print(f"   - Zone {zone_id}: input={state.input_id}, vol={state.volume}, mute={state.is_muted}")
-            print()
+            lines = [f"✅ Retrieved {len(states)} zone states:"]
+            lines.extend(
+                f"   - Zone {zone_id}: input={state.input_id}, vol={state.volume}, mute={state.is_muted}"
+                for zone_id, state in states.items()
+            )
+            sys.stdout.write("\n".join(lines) + "\n\n")
         except Exception as e:
             print(f"❌ Multiple zones test failed: {e}\n")
 
-        print(f"{'='*60}")
-        print("Test Summary:")
-        print("If you see mostly ✅, the integration should work!")
-        print("If you see ❌, copy the output and send it back.")
-        print(f"{'='*60}\n")
+        sys.stdout.write(
+            f"{_BANNER}\n"
+            "Test Summary:\n"
+            "If you see mostly ✅, the integration should work!\n"
+            "If you see ❌, copy the output and send it back.\n"
+            f"{_BANNER}\n\n"
+        )
 
     except Exception as e:
         print(f"❌ Fatal error: {e}\n")
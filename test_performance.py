@@ -8,26 +8,29 @@ sys.path.insert(0, 'custom_components/knoxcham64i')
 
 from chameleon_client import ChameleonClient
 
+_BANNER = "=" * 60
+_RULE = "-" * 60
+
 
 async def test():
     client = ChameleonClient(host="192.168.0.69", port=8899)
 
     try:
-        print("\n" + "="*60)
-        print("PERFORMANCE TEST")
-        print("="*60)
+        print(f"\n{_BANNER}\nPERFORMANCE TEST\n{_BANNER}")
 
         # Test 1: Get 3 zones using optimized batch method
+        # (one D0136 crosspoint dump for all zones instead of a round-trip each)
+        zones = [1, 2, 25]
         start = time.time()
-        states = await client.get_all_zones_state([1, 2, 25])
-        for zone in [1, 2, 25]:
+        states = await client.get_all_zones_state(zones)
+        for zone in zones:
             state = states[zone]
             print(f"Zone {zone}: input={state.input_id}, vol={state.volume}, mute={state.is_muted}")
         elapsed = time.time() - start
         print(f"\n⏱️  Time to get 3 zones (optimized): {elapsed:.2f} seconds")
 
         # Test 2: Set input
-        print("\n" + "-"*60)
+        print("\n" + _RULE)
         start = time.time()
         await client.set_input(25, 1)
         elapsed = time.time() - start
@@ -39,9 +42,7 @@ async def test():
         elapsed = time.time() - start
         print(f"⏱️  Time to set volume: {elapsed:.2f} seconds")
 
-        print("\n" + "="*60)
-        print("Performance test complete!")
-        print("="*60)
+        print(f"\n{_BANNER}\nPerformance test complete!\n{_BANNER}")
 
     except Exception as e:
         print(f"\n❌ Error: {e}")
@@ -7,6 +7,9 @@ sys.path.insert(0, 'custom_components/knoxcham64i')
 from chameleon_client.connection_blocking import ChameleonConnectionBlocking
 import asyncio
 
+# Zone number is right-aligned in a 2-wide field; accept either padding
+_ZONE25_MARKERS = ("OUTPUT   25 ", "OUTPUT  25 ")
+
 
 async def test():
     conn = ChameleonConnectionBlocking(host="192.168.0.69", port=8899)
@@ -15,15 +18,24 @@ async def test():
     print("Sending D0136 command...")
     response = await conn.send_command("D0136")
 
-    # Find zone 25
-    for line in response.split('\n'):
-        if 'OUTPUT   25 ' in line or 'OUTPUT  25 ' in line:
-            print(f"Zone 25 line: {line}")
-            parts = line.split()
-            if len(parts) >= 6:
-                print(f"  OUTPUT: {parts[1]}")
-                print(f"  VIDEO: {parts[3]}")
-                print(f"  AUDIO: {parts[5]}")
+    # Find zone 25 with a substring search instead of splitting every line
+    for marker in _ZONE25_MARKERS:
+        idx = response.find(marker)
+        if idx >= 0:
+            break
+    else:
+        return
+
+    end = response.find("\r", idx)
+    if end < 0:
+        end = response.find("\n", idx)
+    line = response[idx:end if end >= 0 else len(response)].rstrip()
+    parts = line.split()
+    if len(parts) >= 6:
+        print(f"Zone 25 line: {line}")
+        print(f"  OUTPUT: {parts[1]}")
+        print(f"  VIDEO: {parts[3]}")
+        print(f"  AUDIO: {parts[5]}")
 
 
 if __name__ == "__main__":
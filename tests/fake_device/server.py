@@ -18,14 +18,53 @@ Modes:
 
 import argparse
 import asyncio
+import functools
 import logging
 import random
-import time
+import socket
+from typing import Dict
+
+try:
+    import uvloop
+except ImportError:  # Optional faster event loop - asyncio's default loop is used without it
+    uvloop = None
 
 logging.basicConfig(level=logging.DEBUG)
 _LOGGER = logging.getLogger(__name__)
 
 
+# Power-on zone state as flat per-field tables indexed by zone number (index 0
+# unused). Each device copies these instead of building 64 dicts.
+_INPUT_TEMPLATE = (1,) * 65
+_VOLUME_TEMPLATE = tuple(z % 64 for z in range(65))  # 0-63
+_MUTED_TEMPLATE = (False,) * 65
+
+# Per-zone crosspoint line templates; only the input number varies at runtime
+_OUTPUT_LINE_TMPL = [b""] + [
+    f"OUTPUT   {z:2d}   VIDEO   %2d   AUDIO   %2d".encode() for z in range(1, 65)
+]
+
+# Fixed replies, pre-encoded so they can be written to the socket as-is
+_DONE = b"DONE\r\n"
+_ERROR = b"ERROR\r\n"
+_FW = b"Knox Chameleon64i v1.0 (FAKE)\r\nDONE\r\n"
+
+
+def _d2(b: bytes, i: int) -> int:
+    """Parse the two ASCII digits at b[i:i+2] without building a str."""
+    hi = b[i] - 48
+    lo = b[i + 1] - 48
+    if not (0 <= hi <= 9 and 0 <= lo <= 9):
+        raise ValueError(f"Invalid numeric field {b[i:i + 2]!r}")
+    return hi * 10 + lo
+
+
+@functools.lru_cache(maxsize=128)
+def _vtb_response(volume: int, muted: bool) -> bytes:
+    """VTB reply for a zone; only 64 volumes x 2 mute states are possible."""
+    return f"V:{volume}  M:{1 if muted else 0}  L:0  BL:00 BR:00 B: 0 T: 0\r\n".encode()
+
+
 class FakeKnoxDevice:
     """Fake Knox device for testing."""
 
@@ -35,96 +74,138 @@ class FakeKnoxDevice:
         self._command_count = 0
 
         # Zone state storage
-        self._zones = {}
-        for z in range(1, 65):
-            self._zones[z] = {
-                "input": 1,
-                "volume": z % 64,  # 0-63
-                "muted": False,
-            }
-
-    def process_command(self, command: str) -> str:
-        """Process a command and return response."""
+        self._input = list(_INPUT_TEMPLATE)
+        self._volume = list(_VOLUME_TEMPLATE)
+        self._muted = list(_MUTED_TEMPLATE)
+
+        # Replies to read-only commands ($Dxx, D0136) keyed by the raw
+        # command, dropped whenever a set command changes zone state
+        self._getter_cache: Dict[bytes, bytes] = {}
+
+        # Command prefix -> handler jump table
+        self._dispatch = {
+            b"$M": self._handle_mute,
+            b"$V": self._handle_vol,
+            b"$D": self._handle_vtb,
+            b"B": self._handle_input,
+            b"D": self._handle_crosspoint,
+            b"I": self._handle_fw,
+        }
+
+    @staticmethod
+    def _check_zone(zone: int) -> int:
+        """Reject zone numbers outside 1-64."""
+        if not 1 <= zone <= 64:
+            raise ValueError(f"Invalid zone {zone}")
+        return zone
+
+    def _invalidate(self) -> None:
+        """Forget cached getter replies after a state change."""
+        self._getter_cache.clear()
+
+    async def process_command(self, command: bytes) -> bytes:
+        """Process a raw command and return the encoded response."""
         self._command_count += 1
         command = command.strip()
-        _LOGGER.info(f"[CMD #{self._command_count}] {command}")
+        _LOGGER.info(f"[CMD #{self._command_count}] {command.decode('ascii', 'replace')}")
 
         # Hang mode: stop responding after N commands
         if self.mode == "hang" and self.hang_after > 0:
             if self._command_count > self.hang_after:
                 _LOGGER.warning("HANG MODE: Not responding")
-                return ""  # No response - will cause timeout
+                return b""  # No response - will cause timeout
 
         # Slow mode: add delay
         if self.mode == "slow":
             delay = random.uniform(1.0, 4.0)
             _LOGGER.info(f"SLOW MODE: Delaying {delay:.1f}s")
-            time.sleep(delay)
+            await asyncio.sleep(delay)  # Don't block other clients
 
         # Drop mode: randomly don't respond
         if self.mode == "drop":
             if random.random() < 0.2:  # 20% drop rate
                 _LOGGER.warning("DROP MODE: Dropping response")
-                return ""
+                return b""
 
-        # Parse command
-        try:
-            # Set mute: $Mxx0 or $Mxx1
-            if command.startswith("$M"):
-                zone = int(command[2:4])
-                mute = command[4] == "1"
-                self._zones[zone]["muted"] = mute
-                return "DONE\r\n"
-
-            # Set volume: $Vxxvv
-            if command.startswith("$V"):
-                zone = int(command[2:4])
-                volume = int(command[4:6])
-                self._zones[zone]["volume"] = volume
-                return "DONE\r\n"
-
-            # Get VTB: $Dxx
-            if command.startswith("$D"):
-                zone = int(command[2:4])
-                state = self._zones.get(zone, {"volume": 32, "muted": False})
-                v = state["volume"]
-                m = 1 if state["muted"] else 0
-                response = f"V:{v}  M:{m}  L:0  BL:00 BR:00 B: 0 T: 0\r\n"
-
-                # Partial mode: truncate response
-                if self.mode == "partial":
-                    if random.random() < 0.1:
-                        _LOGGER.warning("PARTIAL MODE: Truncating response")
-                        response = response[:len(response)//2]
-
-                return response
-
-            # Set input: BxxII
-            if command.startswith("B"):
-                zone = int(command[1:3])
-                input_id = int(command[3:5])
-                self._zones[zone]["input"] = input_id
-                return "DONE\r\n"
-
-            # Get crosspoint: D0136 (returns all zones 1-36)
-            if command.startswith("D01"):
-                lines = []
-                for z in range(1, 37):
-                    state = self._zones.get(z, {"input": 1})
-                    inp = state["input"]
-                    lines.append(f"OUTPUT   {z:2d}   VIDEO   {inp:2d}   AUDIO   {inp:2d}")
-                return "\r\n".join(lines) + "\r\nDONE\r\n"
-
-            # Firmware version: I
-            if command == "I":
-                return "Knox Chameleon64i v1.0 (FAKE)\r\nDONE\r\n"
-
-            _LOGGER.warning(f"Unknown command: {command}")
-            return "ERROR\r\n"
+        # Dispatch on the 2-char prefix ($M, $V, $D), else the 1-char one (B, D, I)
+        handler = self._dispatch.get(command[:2]) or self._dispatch.get(command[:1])
+        if handler is None:
+            return self._handle_unknown(command)
 
+        try:
+            return handler(command)
         except Exception as e:
             _LOGGER.error(f"Error processing command: {e}")
-            return "ERROR\r\n"
+            return _ERROR
+
+    def _handle_mute(self, command: bytes) -> bytes:
+        """Set mute: $Mxx0 or $Mxx1."""
+        zone = self._check_zone(_d2(command, 2))
+        mute = command[4] == 0x31  # "1"
+        self._muted[zone] = mute
+        self._invalidate()
+        return _DONE
+
+    def _handle_vol(self, command: bytes) -> bytes:
+        """Set volume: $Vxxvv."""
+        zone = self._check_zone(_d2(command, 2))
+        volume = _d2(command, 4)
+        self._volume[zone] = volume
+        self._invalidate()
+        return _DONE
+
+    def _handle_vtb(self, command: bytes) -> bytes:
+        """Get VTB: $Dxx."""
+        response = self._getter_cache.get(command)
+        if response is None:
+            zone = _d2(command, 2)
+            if 1 <= zone <= 64:
+                response = _vtb_response(self._volume[zone], self._muted[zone])
+            else:
+                response = _vtb_response(32, False)
+            self._getter_cache[command] = response
+
+        # Partial mode: truncate response
+        if self.mode == "partial":
+            if random.random() < 0.1:
+                _LOGGER.warning("PARTIAL MODE: Truncating response")
+                response = response[:len(response)//2]
+
+        return response
+
+    def _handle_input(self, command: bytes) -> bytes:
+        """Set input: BxxII."""
+        zone = self._check_zone(_d2(command, 1))
+        input_id = _d2(command, 3)
+        self._input[zone] = input_id
+        self._invalidate()
+        return _DONE
+
+    def _handle_crosspoint(self, command: bytes) -> bytes:
+        """Get crosspoint: D0136 (returns all zones 1-36)."""
+        if not command.startswith(b"D01"):
+            return self._handle_unknown(command)
+
+        response = self._getter_cache.get(command)
+        if response is None:
+            lines = []
+            for z in range(1, 37):
+                inp = self._input[z]
+                lines.append(_OUTPUT_LINE_TMPL[z] % (inp, inp))
+            response = b"\r\n".join(lines) + b"\r\n" + _DONE
+            self._getter_cache[command] = response
+        return response
+
+    def _handle_fw(self, command: bytes) -> bytes:
+        """Firmware version: I."""
+        if command != b"I":
+            return self._handle_unknown(command)
+        return _FW
+
+    def _handle_unknown(self, command: bytes) -> bytes:
+        """Reply to an unrecognized command."""
+        _LOGGER.warning(f"Unknown command: {command.decode('ascii', 'replace')}")
+        return _ERROR
 
 
 class FakeKnoxServer:
@@ -140,36 +221,51 @@ class FakeKnoxServer:
         addr = writer.get_extra_info("peername")
         _LOGGER.info(f"Client connected: {addr}")
 
+        # Replies are small - send them immediately instead of waiting on
+        # Nagle/delayed-ACK coalescing
+        sock = writer.get_extra_info("socket")
+        if sock is not None:
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+            if hasattr(socket, "TCP_QUICKACK"):  # Linux only
+                sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_QUICKACK, 1)
+
         # Send init bytes (like HF2211A)
         writer.write(b"\xff\xfe")
         await writer.drain()
 
+        buffer = bytearray()
+
         try:
             while True:
-                # Read command until \r
-                data = await asyncio.wait_for(
-                    reader.readuntil(b"\r"),
-                    timeout=30.0
-                )
-                command = data.decode("utf-8", errors="ignore").strip()
-
-                if not command:
-                    continue
-
-                # Process command
-                response = self.device.process_command(command)
-
-                if response:
-                    writer.write(response.encode("utf-8"))
-                    await writer.drain()
-                else:
-                    # No response - simulate timeout
-                    await asyncio.sleep(10)  # Make client timeout
+                # Read whatever is available in one go; pipelined clients can
+                # deliver several \r-terminated commands per read
+                data = await asyncio.wait_for(reader.read(4096), timeout=30.0)
+                if not data:
+                    _LOGGER.info(f"Client disconnected: {addr}")
+                    break
+
+                buffer.extend(data)
+                *lines, tail = buffer.split(b"\r")
+                buffer = tail  # Keep the partial command for the next read
+
+                for line in lines:
+                    command = bytes(line).strip()
+
+                    if not command:
+                        continue
+
+                    # Process command
+                    response = await self.device.process_command(command)
+
+                    # Empty response (hang/drop mode): send nothing and let
+                    # the client's own read timeout fire
+                    if response:
+                        writer.write(response)
+                        await writer.drain()
 
         except asyncio.TimeoutError:
             _LOGGER.info(f"Client timeout: {addr}")
-        except asyncio.IncompleteReadError:
-            _LOGGER.info(f"Client disconnected: {addr}")
         except Exception as e:
             _LOGGER.error(f"Client error: {e}")
         finally:
@@ -182,7 +278,8 @@ class FakeKnoxServer:
         server = await asyncio.start_server(
             self.handle_client,
             self.host,
-            self.port
+            self.port,
+            limit=64 * 1024,
         )
 
         addr = server.sockets[0].getsockname()
@@ -214,4 +311,7 @@ async def main():
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    if uvloop is not None:
+        uvloop.run(main())
+    else:
+        asyncio.run(main())
@@ -0,0 +1,20 @@
+"""Plain stand-ins for the HomeAssistant/ConfigEntry attributes tests touch.
+
+Only the few attributes async_reload_entry reads - much cheaper to build
+than Mock(spec=...).
+"""
+
+from dataclasses import dataclass
+from typing import Any
+
+
+@dataclass(slots=True)
+class FakeHA:
+    data: dict
+    config_entries: Any = None
+
+
+@dataclass(slots=True)
+class FakeEntry:
+    entry_id: str
+    data: dict
@@ -0,0 +1,93 @@
+"""Live-device checks for the Knox integration fixes.
+
+pytest port of verify_all_fixes.py; the checks themselves live in that
+script, so both judge a run the same way. These talk to a real
+Chameleon64i, so the module is skipped unless KNOX_HOST is set:
+
+    KNOX_HOST=192.168.0.69 pytest tests/test_fixes.py
+
+All tests share one module-scoped client (and event loop), and run in file
+order so the write-heavy stress test comes last.
+"""
+
+import os
+
+import pytest
+
+# loop_scope on fixtures and marks needs pytest-asyncio 0.24+
+pytest_asyncio = pytest.importorskip("pytest_asyncio", minversion="0.24")
+
+# Import the shared checks from the repo root (verify_all_fixes.py makes
+# chameleon_client importable itself)
+import sys
+from pathlib import Path
+_REPO_ROOT = str(Path(__file__).parent.parent)
+if _REPO_ROOT not in sys.path:
+    sys.path.append(_REPO_ROOT)
+
+from verify_all_fixes import (
+    NAMING_ZONES,
+    POLL_ZONES,
+    ChameleonClient,
+    naming_zone_states,
+    poll_zones,
+    run_stress,
+    unmuted_zones,
+)
+
+KNOX_HOST = os.environ.get("KNOX_HOST")
+KNOX_PORT = int(os.environ.get("KNOX_PORT", "8899"))
+
+pytestmark = [
+    pytest.mark.skipif(not KNOX_HOST, reason="KNOX_HOST not set - needs a live device"),
+    pytest.mark.asyncio(loop_scope="module"),
+]
+
+
+@pytest_asyncio.fixture(scope="module", loop_scope="module")
+async def client():
+    """One connected client for the whole module."""
+    c = ChameleonClient(host=KNOX_HOST, port=KNOX_PORT, timeout=5.0, max_retries=3)
+    await c.connect()
+    yield c
+    await c.disconnect()
+
+
+async def test_device_connectivity(client):
+    """Basic connectivity."""
+    assert client.is_connected
+
+
+async def test_no_timeouts_with_35_zones(client):
+    """Fix #4: polling 35 zones completes with no timeouts."""
+    poll = await poll_zones(client, POLL_ZONES)
+
+    assert not poll.failed_zones, f"{len(poll.failed_zones)} zones failed: {poll.failed_zones}"
+    assert poll.elapsed <= poll.budget, (
+        f"{poll.elapsed:.1f}s for 35 zones (exceeds {poll.budget:.1f}s budget)"
+    )
+
+
+async def test_muted_zones_report_correct_state(client):
+    """Fix #2: muted zones report is_muted=True, not default ON."""
+    wrong = await unmuted_zones(client)
+    assert not wrong, f"Zones not reporting muted: {wrong}"
+
+
+async def test_zone_data_supports_naming(client):
+    """Fix #5: device returns the zone data entity naming relies on."""
+    states = await naming_zone_states(client)
+    assert len(states) >= len(NAMING_ZONES), (
+        f"Only got {len(states)} zones, expected {len(NAMING_ZONES)}"
+    )
+
+
+async def test_stress_50_operations(client):
+    """Fix #4: 50 rapid set operations with no failures."""
+    run = await run_stress(client)
+
+    failures = run.operations - run.succeeded
+    assert not failures, (
+        f"{failures}/{run.operations} operations failed"
+        f"{' (aborted)' if run.aborted else ''}: {run.errors[:3]}"
+    )
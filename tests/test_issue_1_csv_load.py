@@ -8,9 +8,7 @@ the update has already happened, so it thinks nothing changed.
 """
 
 import pytest
-from unittest.mock import Mock, AsyncMock, patch
-from homeassistant.core import HomeAssistant
-from homeassistant.config_entries import ConfigEntry
+from types import SimpleNamespace
 
 # Import from integration
 import sys
@@ -20,6 +18,8 @@ sys.path.insert(0, str(Path(__file__).parent.parent / "custom_components" / "kno
 from custom_components.knoxcham64i import async_reload_entry
 from custom_components.knoxcham64i.const import DOMAIN, CONF_ZONES
 
+from fakes import FakeEntry, FakeHA
+
 
 @pytest.mark.asyncio
 async def test_csv_load_creates_entities_immediately():
@@ -33,24 +33,23 @@ async def test_csv_load_creates_entities_immediately():
     Expected: full reload triggered, entities created
     Actual (buggy): "only inputs changed" logged, no entities created
     """
-    # Setup mock HA
-    hass = Mock(spec=HomeAssistant)
-    hass.data = {DOMAIN: {}}
+    # Setup fake HA
+    hass = FakeHA(data={DOMAIN: {}})
 
-    # Mock config entry - starts with no zones
-    config_entry = Mock(spec=ConfigEntry)
-    config_entry.entry_id = "test_entry"
-    config_entry.data = {CONF_ZONES: []}
+    # Fake config entry - starts with no zones
+    config_entry = FakeEntry(entry_id="test_entry", data={CONF_ZONES: []})
 
-    # Mock coordinator with reference to old config entry
-    mock_coordinator = Mock()
-    mock_coordinator.config_entry = config_entry  # Same reference!
-    mock_coordinator.data = {}
+    # Fake coordinator with reference to old config entry
+    mock_coordinator = SimpleNamespace(
+        config_entry=config_entry,  # Same reference!
+        data={},
+        async_set_updated_data=lambda *args: None,
+    )
 
     # Store coordinator in hass.data
     hass.data[DOMAIN]["test_entry"] = {
         "coordinator": mock_coordinator,
-        "client": Mock()
+        "client": None,
     }
 
     # Mock the reload function to track if it was called
@@ -58,8 +57,7 @@ async def test_csv_load_creates_entities_immediately():
     async def mock_reload(entry_id):
         reload_called.append(entry_id)
 
-    hass.config_entries = Mock()
-    hass.config_entries.async_reload = mock_reload
+    hass.config_entries = SimpleNamespace(async_reload=mock_reload)
 
     # Now simulate CSV import updating zones (this happens in config_flow)
     # This is the key: config_entry.data is updated IN PLACE
@@ -92,32 +90,33 @@ async def test_input_only_change_does_not_reload():
 
     This is the correct behavior we want to preserve.
     """
-    hass = Mock(spec=HomeAssistant)
-    hass.data = {DOMAIN: {}}
-
-    config_entry = Mock(spec=ConfigEntry)
-    config_entry.entry_id = "test_entry"
-    config_entry.data = {
-        CONF_ZONES: [{"id": 1, "name": "Zone 1"}],
-        "inputs": [{"id": 1, "name": "Input 1"}]
-    }
+    hass = FakeHA(data={DOMAIN: {}})
+
+    config_entry = FakeEntry(
+        entry_id="test_entry",
+        data={
+            CONF_ZONES: [{"id": 1, "name": "Zone 1"}],
+            "inputs": [{"id": 1, "name": "Input 1"}]
+        },
+    )
 
-    mock_coordinator = Mock()
-    mock_coordinator.config_entry = config_entry
-    mock_coordinator.data = {1: Mock(input_id=1, volume=10, is_muted=False)}
-    mock_coordinator.async_set_updated_data = Mock()
+    updates = []
+    mock_coordinator = SimpleNamespace(
+        config_entry=config_entry,
+        data={1: SimpleNamespace(input_id=1, volume=10, is_muted=False)},
+        async_set_updated_data=updates.append,
+    )
 
     hass.data[DOMAIN]["test_entry"] = {
         "coordinator": mock_coordinator,
-        "client": Mock()
+        "client": None,
     }
 
     reload_called = []
     async def mock_reload(entry_id):
         reload_called.append(entry_id)
 
-    hass.config_entries = Mock()
-    hass.config_entries.async_reload = mock_reload
+    hass.config_entries = SimpleNamespace(async_reload=mock_reload)
 
     # Update ONLY inputs (zones unchanged)
     config_entry.data = {
@@ -129,7 +128,7 @@ async def test_input_only_change_does_not_reload():
 
     # Should NOT reload, just notify entities
     assert len(reload_called) == 0, "Input-only change should not trigger full reload"
-    assert mock_coordinator.async_set_updated_data.called, "Should notify entities of input change"
+    assert updates, "Should notify entities of input change"
 
 
 if __name__ == "__main__":
@@ -3,7 +3,7 @@
 import asyncio
 import sys
 from pathlib import Path
-from unittest.mock import Mock
+from types import SimpleNamespace
 
 # Add integration to path
 sys.path.insert(0, str(Path(__file__).parent.parent / "custom_components" / "knoxcham64i"))
@@ -11,6 +11,8 @@ sys.path.insert(0, str(Path(__file__).parent.parent / "custom_components" / "kno
 from __init__ import async_reload_entry
 from const import DOMAIN, CONF_ZONES
 
+from fakes import FakeEntry, FakeHA
+
 
 async def test_csv_load_bug():
     """Reproduce the CSV load bug."""
@@ -18,23 +20,22 @@ async def test_csv_load_bug():
     print("REPRODUCING ISSUE #1: CSV Load Does Nothing Until Manual Reload")
     print("=" * 70)
 
-    # Setup mock HA
-    hass = Mock()
-    hass.data = {DOMAIN: {}}
+    # Setup fake HA
+    hass = FakeHA(data={DOMAIN: {}})
 
     # Config entry starts with NO zones
-    config_entry = Mock()
-    config_entry.entry_id = "test_entry"
-    config_entry.data = {CONF_ZONES: []}
+    config_entry = FakeEntry(entry_id="test_entry", data={CONF_ZONES: []})
 
-    # Mock coordinator references the SAME config entry
-    mock_coordinator = Mock()
-    mock_coordinator.config_entry = config_entry  # SAME REFERENCE = BUG!
-    mock_coordinator.data = {}
+    # Fake coordinator references the SAME config entry
+    mock_coordinator = SimpleNamespace(
+        config_entry=config_entry,  # SAME REFERENCE = BUG!
+        data={},
+        async_set_updated_data=lambda *args: None,
+    )
 
     hass.data[DOMAIN]["test_entry"] = {
         "coordinator": mock_coordinator,
-        "client": Mock()
+        "client": None,
     }
 
     # Track if reload was called
@@ -44,8 +45,7 @@ async def test_csv_load_bug():
         reload_called.append(entry_id)
         print(f"  ✓ Full reload triggered for {entry_id}")
 
-    hass.config_entries = Mock()
-    hass.config_entries.async_reload = mock_reload
+    hass.config_entries = SimpleNamespace(async_reload=mock_reload)
 
     print("\n1. Initial state: 0 zones configured")
     print(f"   old_zones: {config_entry.data.get(CONF_ZONES, [])}")
@@ -0,0 +1,56 @@
+"""Test refresh admission control in ChameleonClient.get_all_zones_state.
+
+A waiter cancelled right after being woken must not swallow the wake-up
+and leave later refreshes waiting forever on a free slot.
+"""
+
+import asyncio
+
+import pytest
+
+# Import from integration; appended so select.py there can't shadow stdlib
+import sys
+from pathlib import Path
+_CLIENT_PATH = str(Path(__file__).parent.parent / "custom_components" / "knoxcham64i")
+if _CLIENT_PATH not in sys.path:
+    sys.path.append(_CLIENT_PATH)
+
+from chameleon_client import ChameleonClient
+
+
+@pytest.mark.asyncio
+async def test_cancelled_waiter_does_not_strand_others():
+    """Cancel a woken waiter before it re-takes the lock; the next one still runs."""
+    client = ChameleonClient(host="127.0.0.1")
+    release_first = asyncio.Event()
+
+    async def fake_refresh(zones, max_refresh_seconds, previous_states):
+        if zones == [1]:
+            await release_first.wait()
+        return {}
+
+    client._get_all_zones_state = fake_refresh
+
+    first = asyncio.create_task(client.get_all_zones_state([1]))
+    await asyncio.sleep(0)
+    second = asyncio.create_task(client.get_all_zones_state([2]))
+    third = asyncio.create_task(client.get_all_zones_state([3]))
+    await asyncio.sleep(0)  # second and third now wait for the slot
+
+    # Cancel the second call as soon as the first one's release wakes it
+    cv = client._refresh_cv
+    for name in ("notify", "notify_all"):
+        original = getattr(cv, name)
+
+        def wake_then_cancel(*args, _original=original, **kwargs):
+            _original(*args, **kwargs)
+            second.cancel()
+
+        setattr(cv, name, wake_then_cancel)
+
+    release_first.set()
+    assert await first == {}
+    assert await asyncio.wait_for(third, timeout=1.0) == {}
+    with pytest.raises(asyncio.CancelledError):
+        await second
+    assert client._active_refreshes == 0
@@ -0,0 +1,54 @@
+"""Test CommandScheduler handling of requests cancelled while queued.
+
+A caller that is cancelled before the worker reaches its request must not
+have the command sent to the device anyway.
+"""
+
+import asyncio
+import threading
+
+import pytest
+
+# Import from integration; appended so select.py there can't shadow stdlib
+import sys
+from pathlib import Path
+_CLIENT_PATH = str(Path(__file__).parent.parent / "custom_components" / "knoxcham64i")
+if _CLIENT_PATH not in sys.path:
+    sys.path.append(_CLIENT_PATH)
+
+from chameleon_client.scheduler import CommandScheduler, Priority
+
+
+@pytest.mark.asyncio
+async def test_cancelled_queued_request_is_not_executed():
+    """Cancel a queued submit(); the worker skips it and runs the next one."""
+    executed = []
+    release_first = threading.Event()
+
+    def execute(command, trace_id):
+        executed.append(command)
+        if command == "first":
+            release_first.wait(timeout=5.0)
+        return f"{command} DONE"
+
+    scheduler = CommandScheduler(execute_fn=execute)
+    await scheduler.start()
+    try:
+        first = asyncio.create_task(scheduler.submit("first", Priority.HIGH))
+        while not executed:  # first is now on the (executor) wire
+            await asyncio.sleep(0.01)
+        second = asyncio.create_task(scheduler.submit("second", Priority.HIGH))
+        third = asyncio.create_task(scheduler.submit("third", Priority.HIGH))
+        await asyncio.sleep(0)  # second and third are queued
+
+        second.cancel()
+        release_first.set()
+
+        assert await first == "first DONE"
+        assert await asyncio.wait_for(third, timeout=1.0) == "third DONE"
+        with pytest.raises(asyncio.CancelledError):
+            await second
+        assert executed == ["first", "third"]
+    finally:
+        release_first.set()
+        await scheduler.stop()
@@ -12,34 +12,92 @@ Expected: All tests pass with 0 failures.
 """
 
 import asyncio
+import contextvars
+import os
 import sys
 import time
+from dataclasses import dataclass, field
 from pathlib import Path
+from typing import Dict, List, Tuple
 
-# Add integration to path
-sys.path.insert(0, str(Path(__file__).parent / "custom_components" / "knoxcham64i"))
+# Make chameleon_client importable without pulling in the HA integration.
+# Appended (once) rather than prepended so the integration's modules, e.g.
+# select.py, can't shadow the stdlib ones of the same name.
+_CLIENT_PATH = str(Path(__file__).parent / "custom_components" / "knoxcham64i")
+if _CLIENT_PATH not in sys.path:
+    sys.path.append(_CLIENT_PATH)
 
-from chameleon_client import ChameleonClient
+from chameleon_client import ChameleonClient, ZoneState
+
+# Print each result as it happens instead of all at once at the end
+VERBOSE = bool(os.environ.get("VERIFY_VERBOSE"))
+
+# Heading of the verify_* test currently running; each gather() task gets
+# its own copy, so concurrent tests tag their results correctly
+_current_test: contextvars.ContextVar[str] = contextvars.ContextVar("current_test", default="")
+
+
+# Monotonic high-resolution clock for elapsed times; immune to NTP/wall
+# clock jumps during the long polling tests
+now_ns = time.perf_counter_ns
+
+
+def begin_test(heading: str) -> None:
+    """Tag the following results with heading."""
+    _current_test.set(heading)
+    if VERBOSE:
+        print(f"\n{heading}")
+
+
+def _format_result(test_name: str, passed: bool, message: str) -> str:
+    if passed:
+        line = f"  ✓ PASS: {test_name}"
+        return f"{line}\n         {message}" if message else line
+    return f"  ✗ FAIL: {test_name}\n         {message}"
 
 
 class TestResults:
-    """Track test results."""
+    """Track test results.
+
+    Only used from the event loop thread; add() never awaits, so tests run
+    together with asyncio.gather() can't interleave within one result.
+    Results (and detail notes) are recorded and written by flush(), grouped
+    by test heading, unless VERIFY_VERBOSE is set.
+    """
     def __init__(self):
         self.passed = 0
         self.failed = 0
-        self.tests = []
+        self.tests = []  # (heading, test_name, passed, message)
+        self._lines = []  # (heading, text) in output order
 
     def add(self, test_name: str, passed: bool, message: str = ""):
-        self.tests.append((test_name, passed, message))
+        self.tests.append((_current_test.get(), test_name, passed, message))
         if passed:
             self.passed += 1
-            print(f"  ✓ PASS: {test_name}")
-            if message:
-                print(f"         {message}")
         else:
             self.failed += 1
-            print(f"  ✗ FAIL: {test_name}")
-            print(f"         {message}")
+        self._emit(_format_result(test_name, passed, message))
+
+    def note(self, message: str):
+        """Record a detail line under the current test; not a pass/fail."""
+        self._emit(f"    {message}")
+
+    def _emit(self, text: str):
+        if VERBOSE:
+            print(text)
+        else:
+            self._lines.append((_current_test.get(), text))
+
+    def flush(self):
+        """Write all recorded results in one go (no-op in verbose mode)."""
+        if VERBOSE:
+            return
+        groups = {}
+        for heading, text in self._lines:
+            groups.setdefault(heading, []).append(text)
+        sys.stdout.write("".join(
+            f"\n{heading}\n" + "\n".join(lines) + "\n" for heading, lines in groups.items()
+        ))
 
     def summary(self):
         print("\n" + "=" * 70)
@@ -48,7 +106,7 @@ class TestResults:
         if self.failed > 0:
             print("\n⚠️  DO NOT COMMIT - Tests failed!")
             print("\nFailed tests:")
-            for name, passed, msg in self.tests:
+            for _, name, passed, msg in self.tests:
                 if not passed:
                     print(f"  - {name}: {msg}")
             return False
@@ -57,53 +115,176 @@ class TestResults:
             return True
 
 
+# ============================================================================
+# Checks shared with tests/test_fixes.py - keep the pass/fail logic here so
+# the script and the pytest port can't drift apart
+# ============================================================================
+
+# From logs: zones 30, 34, 35 are muted
+MUTED_ZONES = [30, 34, 35]
+NAMING_ZONES = [1, 13, 25]
+POLL_ZONES = list(range(1, 36))
+
+
+@dataclass
+class ZonePoll:
+    """Outcome of one get_all_zones_state() poll."""
+    states: Dict[int, ZoneState]
+    failed_zones: List[int]
+    success_rate: float
+    elapsed: float
+    budget: float
+    p95: float
+
+
+@dataclass
+class StressRun:
+    """Outcome of run_stress()."""
+    operations: int
+    succeeded: int
+    elapsed: float
+    aborted: bool
+    errors: List[Tuple[int, Exception]] = field(default_factory=list)  # (index, error)
+
+
+async def poll_zones(client: ChameleonClient, zone_ids: List[int]) -> ZonePoll:
+    """Poll zone_ids once and judge the result against the time budget."""
+    expected = frozenset(zone_ids)
+    start_ns = now_ns()
+    states = await client.get_all_zones_state(zone_ids)
+    elapsed = (now_ns() - start_ns) / 1e9
+
+    # A key-type slip (e.g. "1" vs 1) would otherwise show up as every
+    # zone failing
+    assert all(type(zid) is int for zid in states), "state keys must be int zone IDs"
+
+    # Budget scales with the observed per-zone latency but never exceeds
+    # the hard 120s limit (p95 comes from this same poll, so only the
+    # ceiling catches a uniformly slower device)
+    p95 = client.vtb_latency_p95() or 0.0
+    budget = min(120.0, 2.0 * p95 * len(zone_ids)) if p95 else 120.0
+    return ZonePoll(
+        states=states,
+        failed_zones=sorted(expected - states.keys()),
+        success_rate=len(expected & states.keys()) / len(expected) * 100,
+        elapsed=elapsed,
+        budget=budget,
+        p95=p95,
+    )
+
+
+async def unmuted_zones(client: ChameleonClient) -> List[int]:
+    """MUTED_ZONES that don't report is_muted=True."""
+    states = await client.get_all_zones_state(MUTED_ZONES)
+    return [z for z in MUTED_ZONES if z not in states or states[z].is_muted is not True]
+
+
+async def naming_zone_states(client: ChameleonClient) -> Dict[int, ZoneState]:
+    """NAMING_ZONES states, reusing a recent poll when one is cached."""
+    states = client.get_cached_states(NAMING_ZONES, max_age=30.0)
+    if len(states) < len(NAMING_ZONES):
+        states = await client.get_all_zones_state(NAMING_ZONES)
+    return states
+
+
+class _StressAborted(Exception):
+    """Too many stress-test failures; stop issuing operations."""
+
+
+async def run_stress(
+    client: ChameleonClient,
+    test_zone: int = 1,
+    operations: int = 50,
+    concurrency: int = 5,
+    max_failures: int = 5,
+) -> StressRun:
+    """Run the mute/volume/input stress schedule against test_zone.
+
+    Up to `concurrency` operations are in flight (the client still
+    serializes them on the device connection). Past `max_failures` the
+    remaining operations are cancelled; the scheduler drops the ones still
+    queued, but the command already on the wire runs to completion.
+    """
+    # Alternate between different operations; the whole schedule is built
+    # up front as (kind, value) pairs
+    schedule = [
+        ("mute", i % 2 == 0) if i % 3 == 0
+        else ("vol", i % 64) if i % 3 == 1
+        else ("in", 1 + (i % 2))
+        for i in range(operations)
+    ]
+    fn = {"mute": client.set_mute, "vol": client.set_volume, "in": client.set_input}
+    sem = asyncio.Semaphore(concurrency)
+    errors = []
+    succeeded = 0
+
+    async def run(i, kind, value):
+        nonlocal succeeded
+        async with sem:
+            try:
+                await fn[kind](test_zone, value)
+            except Exception as e:
+                errors.append((i, e))
+                if len(errors) > max_failures:
+                    # Cancels the other ops in the group
+                    raise _StressAborted from e
+            else:
+                succeeded += 1
+
+    start_ns = now_ns()
+    aborted = False
+    try:
+        async with asyncio.TaskGroup() as tg:
+            for i, (kind, value) in enumerate(schedule):
+                tg.create_task(run(i, kind, value))
+    except* _StressAborted:
+        aborted = True
+    elapsed = (now_ns() - start_ns) / 1e9
+
+    errors.sort(key=lambda err: err[0])
+    return StressRun(operations, succeeded, elapsed, aborted, errors)
+
+
+# ============================================================================
+# Script checks
+# ============================================================================
+
 async def verify_fix_4_no_timeouts(client: ChameleonClient, results: TestResults):
     """Verify Fix #4: Connection throttling prevents timeouts.
 
     Test: Poll 35 zones concurrently with semaphore limiting connections.
     Expected: 0 timeouts (was 8.5% failure rate before fix).
     """
-    print("\nTest 4: Fix #4 - No timeouts with 35 concurrent zones")
-
-    zone_ids = list(range(1, 36))
-    start_time = time.time()
+    begin_test("Test 4: Fix #4 - No timeouts with 35 concurrent zones")
 
     try:
-        # This should trigger the semaphore throttling
-        states = await client.get_all_zones_state(zone_ids)
-        elapsed = time.time() - start_time
-
-        # Check for failures
-        failed_zones = [zid for zid in zone_ids if zid not in states]
-        success_rate = len(states) / len(zone_ids) * 100
+        poll = await poll_zones(client, POLL_ZONES)
 
-        if len(failed_zones) == 0:
+        if not poll.failed_zones:
             results.add(
                 "No timeouts with concurrent polling",
                 True,
-                f"{len(states)}/35 zones polled in {elapsed:.1f}s (100% success)"
+                f"{len(poll.states)}/35 zones polled in {poll.elapsed:.1f}s (100% success)"
             )
         else:
             results.add(
                 "No timeouts with concurrent polling",
                 False,
-                f"{len(failed_zones)} zones failed: {failed_zones} ({success_rate:.1f}% success)"
+                f"{len(poll.failed_zones)} zones failed: {poll.failed_zones} "
+                f"({poll.success_rate:.1f}% success)"
             )
 
-        # Performance check - realistic expectations for HF2211A adapter
-        # Sequential execution (semaphore=1) takes ~60s for reliability
-        # Coordinator polls every 300s, so 60s is acceptable
-        if elapsed <= 120.0:  # Under 2 minutes is acceptable
+        if poll.elapsed <= poll.budget:
             results.add(
                 "Performance acceptable for coordinator polling",
                 True,
-                f"{elapsed:.1f}s for 35 zones (under 120s limit, coordinator polls every 300s)"
+                f"{poll.elapsed:.1f}s for 35 zones (budget {poll.budget:.1f}s, p95 {poll.p95:.2f}s per zone)"
             )
         else:
             results.add(
                 "Performance acceptable for coordinator polling",
                 False,
-                f"{elapsed:.1f}s (exceeds 120s limit)"
+                f"{poll.elapsed:.1f}s (exceeds {poll.budget:.1f}s budget, p95 {poll.p95:.2f}s per zone)"
             )
 
     except Exception as e:
@@ -116,31 +297,22 @@ async def verify_fix_2_correct_initial_state(client: ChameleonClient, results: T
     Test: Query zones that are known to be muted.
     Expected: State correctly reflects mute status, NOT default to ON.
     """
-    print("\nTest 2: Fix #2 - Correct initial state (not default ON)")
+    begin_test("Test 2: Fix #2 - Correct initial state (not default ON)")
 
     try:
-        # From logs: zones 30, 34, 35 are muted
-        muted_zones = [30, 34, 35]
-        states = await client.get_all_zones_state(muted_zones)
-
-        correct_count = 0
-        for zone_id in muted_zones:
-            if zone_id in states:
-                state = states[zone_id]
-                if state.is_muted is True:
-                    correct_count += 1
-
-        if correct_count == len(muted_zones):
+        wrong = await unmuted_zones(client)
+
+        if not wrong:
             results.add(
                 "Muted zones report correct state",
                 True,
-                f"All {len(muted_zones)} muted zones correctly report is_muted=True"
+                f"All {len(MUTED_ZONES)} muted zones correctly report is_muted=True"
             )
         else:
             results.add(
                 "Muted zones report correct state",
                 False,
-                f"Only {correct_count}/{len(muted_zones)} zones correctly report mute state"
+                f"Only {len(MUTED_ZONES) - len(wrong)}/{len(MUTED_ZONES)} zones correctly report mute state"
             )
 
     except Exception as e:
@@ -152,45 +324,40 @@ async def verify_fix_4_stress_test(client: ChameleonClient, results: TestResults
 
     Test: Run 50 rapid toggle operations across multiple zones.
     Expected: 100% success rate, no timeouts.
-    """
-    print("\nTest 5: Fix #4 - Stress test (50 operations)")
 
-    test_zone = 1
-    operations = 50
-    failures = 0
+    Each operation is its own device command - the Knox protocol has no
+    multi-write command, and batching them would defeat the stress test.
+    """
+    begin_test("Test 5: Fix #4 - Stress test (50 operations)")
 
     try:
-        start_time = time.time()
+        run = await run_stress(client)
 
-        for i in range(operations):
-            try:
-                # Alternate between different operations
-                if i % 3 == 0:
-                    await client.set_mute(test_zone, i % 2 == 0)
-                elif i % 3 == 1:
-                    await client.set_volume(test_zone, (i % 64))
-                else:
-                    await client.set_input(test_zone, 1 + (i % 2))
-
-            except Exception as e:
-                failures += 1
-                if failures <= 3:  # Only log first 3 failures
-                    print(f"    Operation {i+1} failed: {e}")
-
-        elapsed = time.time() - start_time
-        success_rate = (operations - failures) / operations * 100
+        # Report after timing so output isn't counted as device time
+        for i, e in run.errors[:3]:  # Only show first 3 failures
+            results.note(f"Operation {i + 1} failed: {e}")
+        failures = run.operations - run.succeeded
+        success_rate = run.succeeded / run.operations * 100
 
         if failures == 0:
             results.add(
                 "Stress test: 0 failures",
                 True,
-                f"{operations} operations in {elapsed:.1f}s (100% success, {operations/elapsed:.1f} ops/sec)"
+                f"{run.operations} operations in {run.elapsed:.1f}s "
+                f"(100% success, {run.operations/run.elapsed:.1f} ops/sec)"
+            )
+        elif run.aborted:
+            results.add(
+                "Stress test: 0 failures",
+                False,
+                f"Aborted after {len(run.errors)} failures in {run.elapsed:.1f}s "
+                f"({run.succeeded}/{run.operations} operations succeeded)"
             )
         else:
             results.add(
                 "Stress test: 0 failures",
                 False,
-                f"{failures}/{operations} operations failed ({success_rate:.1f}% success)"
+                f"{failures}/{run.operations} operations failed ({success_rate:.1f}% success)"
             )
 
     except Exception as e:
@@ -199,12 +366,18 @@ async def verify_fix_4_stress_test(client: ChameleonClient, results: TestResults
 
 async def verify_connection_basic(client: ChameleonClient, results: TestResults):
     """Basic connectivity test."""
-    print("\nTest 1: Basic connectivity")
+    begin_test("Test 1: Basic connectivity")
 
     try:
+        # The only connect() in the run; later tests reuse this client
         await client.connect()
-        connected = await client.test_connection()
-        results.add("Device connectivity", connected, "Connection established")
+        # is_connected is always True with a socket per command, so prove
+        # the device answers with one cheap round trip (I command)
+        version = await client.get_firmware_version()
+        if version:
+            results.add("Device connectivity", True, f"Device answered: {version}")
+        else:
+            results.add("Device connectivity", False, "No reply to firmware query (I)")
     except Exception as e:
         results.add("Device connectivity", False, str(e))
 
@@ -213,13 +386,14 @@ async def verify_fix_5_entity_naming(client: ChameleonClient, results: TestResul
     """Verify Fix #5: Entity names come from zone config.
 
     This is a documentation test - the actual fix is in media_player.py.
-    We verify the device can return zone data that will be used for naming.
+    We verify the device can return zone data that will be used for naming,
+    reusing the Test 4 poll when it is recent enough.
     """
-    print("\nTest 3: Fix #5 - Entity naming (infrastructure check)")
+    begin_test("Test 3: Fix #5 - Entity naming (infrastructure check)")
 
     try:
         # Query a few zones to ensure data structure supports naming
-        states = await client.get_all_zones_state([1, 13, 25])
+        states = await naming_zone_states(client)
 
         if len(states) >= 3:
             results.add(
@@ -252,22 +426,26 @@ async def main():
         # Test 1: Basic connectivity
         await verify_connection_basic(client, results)
 
-        # Test 2: Fix #2 - Correct initial state
-        await verify_fix_2_correct_initial_state(client, results)
-
-        # Test 3: Fix #5 - Entity naming infrastructure
-        await verify_fix_5_entity_naming(client, results)
-
         # Test 4: Fix #4 - No timeouts with 35 zones
+        # Runs early so its poll of zones 1-35 can serve Test 3 from cache
         await verify_fix_4_no_timeouts(client, results)
 
+        # Test 2: Fix #2 - Correct initial state
+        # Test 3: Fix #5 - Entity naming infrastructure
+        # Read-only checks on disjoint zones, so run them together
+        await asyncio.gather(
+            verify_fix_2_correct_initial_state(client, results),
+            verify_fix_5_entity_naming(client, results),
+        )
+
         # Test 5: Fix #4 - Stress test
         await verify_fix_4_stress_test(client, results)
 
     finally:
         await client.disconnect()
 
-    # Print summary
+    # Print results and summary
+    results.flush()
     success = results.summary()
 
     # Additional notes